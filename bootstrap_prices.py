@@ -1,28 +1,33 @@
 # bootstrap_prices.py
-import os, requests, pandas as pd
+import os, requests, orjson, numpy as np, pandas as pd
+import pyarrow as pa, pyarrow.parquet as pq
 from datetime import date
 from pathlib import Path
 
 KRAKEN_PAIR = os.getenv("KRAKEN_PAIR", "XETHZUSD")
 DATA_DIR = Path("data"); DATA_DIR.mkdir(exist_ok=True)
 PRICES = DATA_DIR / "eth_prices.parquet"
+# Same on-disk format as main.py's PX_SCHEMA / PQ_WRITE_OPTS
+PX_SCHEMA = pa.schema([("ts", pa.date32()), ("price_usd", pa.float64())])
+PQ_WRITE_OPTS = dict(compression="zstd", use_dictionary=True,
+                     write_statistics=True, data_page_size=64 * 1024)
 
 def pull_ohlc(days=90):
     url = f"https://api.kraken.com/0/public/OHLC?pair={KRAKEN_PAIR}&interval=1440"
-    r = requests.get(url, timeout=15); r.raise_for_status()
-    js = r.json()["result"]
+    r = requests.get(url, headers={"Accept-Encoding": "gzip"}, timeout=15); r.raise_for_status()
+    js = orjson.loads(r.content)["result"]
     key = next(k for k in js.keys() if k != "last")
-    rows = []
-    for o in js[key][-days:]:
-        ts, close = o[0], float(o[4])
-        rows.append({"ts": date.fromtimestamp(ts), "price_usd": close})
-    return pd.DataFrame(rows)
+    bars = js[key][-days:]  # [time, o, h, l, c, v, ...]
+    ts = [date.fromtimestamp(o[0]) for o in bars]
+    close = np.fromiter((float(o[4]) for o in bars), dtype=np.float64, count=len(bars))
+    return pd.DataFrame({"ts": ts, "price_usd": close})
 
 if __name__ == "__main__":
     df = pull_ohlc(90)
     if PRICES.exists():
         old = pd.read_parquet(PRICES)
         df = pd.concat([old, df]).drop_duplicates(subset=["ts"]).sort_values("ts")
-    df.to_parquet(PRICES, index=False)
+    table = pa.Table.from_pandas(df, schema=PX_SCHEMA, preserve_index=False)
+    pq.write_table(table, PRICES, **PQ_WRITE_OPTS)
     print(df.tail())
 
@@ -1,12 +1,21 @@
 import os
 import sys
+import atexit
 import json
 import pathlib
 import requests
+from concurrent.futures import ThreadPoolExecutor
+from requests.adapters import HTTPAdapter
+import numpy as np
 import pandas as pd
-from datetime import datetime, timezone, date, timedelta
+import pyarrow as pa
+import pyarrow.parquet as pq
+from datetime import datetime, timezone, date
 from dotenv import load_dotenv
 
+import orjson
+from numba import njit
+
 # =========================================================
 # Config
 # =========================================================
@@ -38,6 +47,10 @@ HEADERS = {
     "Accept": "*/*",
 }
 
+# Shared session so concurrent/paged requests reuse pooled keep-alive connections
+SESSION = requests.Session()
+SESSION.mount("https://", HTTPAdapter(pool_connections=8, pool_maxsize=8))
+
 BASE_DIR = pathlib.Path(__file__).resolve().parent
 DATA_DIR = BASE_DIR / "data"
 LOGS_DIR = BASE_DIR / "logs"
@@ -49,37 +62,113 @@ F_EX = DATA_DIR / "eth_exchange_flows.parquet"
 F_PX = DATA_DIR / "eth_prices.parquet"
 F_SIG = DATA_DIR / "eth_signals.parquet"
 
+# Fixed on-disk schemas (ts as date32 so row-group stats allow ts filters)
+SM_SCHEMA = pa.schema([
+    ("ts", pa.date32()),
+    ("symbol", pa.string()),
+    ("volume24hUSD", pa.float64()),
+    ("volume7dUSD", pa.float64()),
+    ("volume30dUSD", pa.float64()),
+])
+EX_SCHEMA = pa.schema([
+    ("ts", pa.date32()),
+    ("exchange_flow_usd", pa.float64()),
+])
+PX_SCHEMA = pa.schema([
+    ("ts", pa.date32()),
+    ("price_usd", pa.float64()),
+])
+SIG_SCHEMA = pa.schema(
+    list(SM_SCHEMA) + list(EX_SCHEMA)[1:] + list(PX_SCHEMA)[1:] + [
+        (name, pa.float64()) for name in (
+            "px_ret_7d", "px_ret_30d",
+            "sm_7d_z", "sm_30d_z",
+            "px_ret_7d_z", "px_ret_30d_z",
+            "divergence_7d", "divergence_30d",
+        )
+    ] + [("signal", pa.string())]
+)
+
+PQ_WRITE_OPTS = dict(compression="zstd", use_dictionary=True,
+                     write_statistics=True, data_page_size=64 * 1024)
+
 ROLL_SPAN = 60   # EW rolling span for z-scores
 MIN_PERIODS = 5 # minimum periods before z-scores start being meaningful
-TODAY = date.today()
+TODAY = np.datetime64(date.today(), "D")  # ts columns are datetime64 (date32 on disk)
 
 SMART_MONEY_URL = "https://api.nansen.ai/api/beta/smart-money/inflows"
 FLOW_INTEL_URL = "https://api.nansen.ai/api/beta/tgm/flow-intelligence"
 KRAKEN_OHLC_URL = f"https://api.kraken.com/0/public/OHLC?pair={KRAKEN_PAIR}&interval=1440"
+KRAKEN_HEADERS = {"Accept-Encoding": "gzip"}
 
 
 # =========================================================
 # Utils
 # =========================================================
+_LOG_BUFFER: list[str] = []
+
+
 def log(msg: str) -> None:
     ts = datetime.now(timezone.utc).isoformat()
-    print(f"[{ts}] {msg}")
+    _LOG_BUFFER.append(f"[{ts}] {msg}")
+
 
+def flush_log() -> None:
+    """Write buffered log lines to stdout in one call (once per step)."""
+    if _LOG_BUFFER:
+        sys.stdout.write("\n".join(_LOG_BUFFER) + "\n")
+        sys.stdout.flush()
+        _LOG_BUFFER.clear()
 
-def read_parquet_safe(path: pathlib.Path, schema=None) -> pd.DataFrame:
-    if path.exists():
-        return pd.read_parquet(path)
-    return pd.DataFrame(schema or {})
+
+atexit.register(flush_log)
+
+
+def _conform(tbl: pa.Table, schema: pa.Schema) -> pa.Table:
+    """Reorder/cast `tbl` to `schema`, null-filling any missing columns."""
+    cols = [
+        tbl.column(f.name).cast(f.type) if f.name in tbl.column_names
+        else pa.nulls(tbl.num_rows, f.type)
+        for f in schema
+    ]
+    return pa.Table.from_arrays(cols, schema=schema)
 
 
 def append_parquet(df_new: pd.DataFrame,
                    path: pathlib.Path,
-                   dedupe_cols=("ts",)) -> pd.DataFrame:
-    df_old = read_parquet_safe(path)
-    df_all = pd.concat([df_old, df_new], ignore_index=True)
-    df_all = df_all.drop_duplicates(subset=list(dedupe_cols), keep="last")
-    df_all.to_parquet(path, index=False)
-    return df_all
+                   dedupe_cols=("ts",),
+                   schema: pa.Schema = None) -> pd.DataFrame:
+    """
+    Append `df_new` to `path`, replacing old rows whose dedupe key reappears
+    in `df_new` (keep="last"). With `schema`, both old and new rows are
+    stored with exactly those columns and types.
+    """
+    keys = list(dedupe_cols)
+    df_new = df_new.drop_duplicates(subset=keys, keep="last")
+    new_tbl = pa.Table.from_pandas(df_new, schema=schema, preserve_index=False)
+
+    if not path.exists():
+        pq.write_table(new_tbl, path, **PQ_WRITE_OPTS)
+        return new_tbl.to_pandas(date_as_object=False)
+
+    old_tbl = pq.read_table(path)
+    if schema is None:
+        schema = pa.unify_schemas([old_tbl.schema, new_tbl.schema], promote_options="permissive")
+
+    # Hash-set anti-join of the old dedupe keys against the (few) new ones
+    old_keys = old_tbl.select(keys).to_pandas(date_as_object=False)
+    new_keys = new_tbl.select(keys).to_pandas(date_as_object=False)
+    new_set = set(zip(*(new_keys[c].tolist() for c in keys)))
+    old_keep = np.fromiter(
+        (k not in new_set for k in zip(*(old_keys[c].tolist() for c in keys))),
+        dtype=bool, count=len(old_keys),
+    )
+    if not old_keep.all():
+        old_tbl = old_tbl.filter(pa.array(old_keep))
+
+    all_tbl = pa.concat_tables([_conform(old_tbl, schema), _conform(new_tbl, schema)])
+    pq.write_table(all_tbl, path, **PQ_WRITE_OPTS)
+    return all_tbl.to_pandas(date_as_object=False)
 
 
 #def zscore_ewm(series: pd.Series,
@@ -89,11 +178,68 @@ def append_parquet(df_new: pd.DataFrame,
 #    std = series.ewm(span=span, min_periods=min_periods).std()
 #    return (series - mean) / std
 
+# Module-level + cache=True: compiled once to __pycache__ and reused by
+# later cron runs. fastmath without nnan/ninf: the kernel relies on NaN checks
+@njit(cache=True, boundscheck=False,
+      fastmath={"nsz", "arcp", "contract", "afn", "reassoc"})
+def _ewm_mean_std_numba(x, span, min_periods):
+    """
+    Fused single-pass EWM mean + bias-corrected std, same recurrence as
+    pandas' ewma/ewmcov (adjust=True, ignore_na=False).
+    """
+    n = x.shape[0]
+    mean_out = np.empty(n)
+    std_out = np.empty(n)
+    alpha = 2.0 / (span + 1.0)
+    decay = 1.0 - alpha
+    min_obs = max(min_periods, 1)
+
+    mean = np.nan
+    var = 0.0
+    old_wt = 1.0
+    sum_wt = 1.0
+    sum_wt2 = 1.0
+    nobs = 0
+    for i in range(n):
+        cur = x[i]
+        is_obs = cur == cur
+        if is_obs:
+            nobs += 1
+        if mean == mean:
+            sum_wt *= decay
+            sum_wt2 *= decay * decay
+            old_wt *= decay
+            if is_obs:
+                old_mean = mean
+                if mean != cur:
+                    mean = (old_wt * old_mean + cur) / (old_wt + 1.0)
+                var = (old_wt * (var + (old_mean - mean) ** 2)
+                       + (cur - mean) ** 2) / (old_wt + 1.0)
+                sum_wt += 1.0
+                sum_wt2 += 1.0
+                old_wt += 1.0
+        elif is_obs:
+            mean = cur
+
+        if nobs >= min_obs:
+            mean_out[i] = mean
+            num = sum_wt * sum_wt
+            den = num - sum_wt2
+            std_out[i] = np.sqrt(num / den * var) if den > 0.0 else np.nan
+        else:
+            mean_out[i] = np.nan
+            std_out[i] = np.nan
+    return mean_out, std_out
+
+
 def zscore_ewm(series, span=ROLL_SPAN, min_periods=MIN_PERIODS):
-    mean = series.ewm(span=span, min_periods=min_periods).mean()
-    std  = series.ewm(span=span, min_periods=min_periods).std().replace(0, 1e-12)
-    z = (series - mean) / std
-    return z.fillna(0.0).replace([float("inf"), -float("inf")], 0.0)
+    x = series.to_numpy(dtype=float, na_value=np.nan)
+    mean, std = _ewm_mean_std_numba(x, span, min_periods)
+    std[std == 0] = 1e-12
+    with np.errstate(divide="ignore", invalid="ignore"):
+        z = (x - mean) / std
+    z[~np.isfinite(z)] = 0.0
+    return pd.Series(z, index=series.index, name=series.name)
 
 
 def send_telegram(text: str) -> None:
@@ -113,6 +259,28 @@ def send_telegram(text: str) -> None:
 # Fetchers
 # =========================================================
 WETH_ADDR = "0xC02aaA39b223FE8D0A0e5C4F27eAD9083C756Cc2".lower()
+_TRASH_TABLE = str.maketrans("", "", "🌱")  # decorations stripped from token symbols
+_MATCH_COLS = ["_chain", "_addr", "_sym", "volume24hUSD", "volume7dUSD", "volume30dUSD", "matched_by"]
+
+def _str_col(df: pd.DataFrame, name: str) -> pd.Series:
+    """String column with missing values as "" (absent column -> all "")."""
+    if name not in df:
+        return pd.Series("", index=df.index, dtype=object)
+    return df[name].fillna("").astype(str)
+
+
+def _num_col(df: pd.DataFrame, name: str) -> np.ndarray:
+    """float64 array of a column with missing / unparsable values as 0."""
+    if name not in df:
+        return np.zeros(len(df))
+    vals = pd.to_numeric(df[name], errors="coerce").to_numpy(dtype=np.float64, na_value=np.nan)
+    return np.nan_to_num(vals, nan=0.0)
+
+
+def _vol_rows(df: pd.DataFrame):
+    """(symbol, 7d volume, 30d volume) tuples for log output."""
+    return zip(df["_sym"], _num_col(df, "volume7dUSD"), _num_col(df, "volume30dUSD"))
+
 
 def fetch_smart_money_inflows_eth() -> pd.DataFrame:
     """
@@ -146,104 +314,97 @@ def fetch_smart_money_inflows_eth() -> pd.DataFrame:
             "includeNativeTokens": True,
             "excludeSmFilter": []
         },
-        "pagination": {
-            "page": 1,
-            "recordsPerPage": 100
-        }
     }
 
-    all_data = []
-    all_eth_tokens = []
+    pages_out = []  # matched ETH rows of every page, tagged with their page number
+    total_tokens = eth_tokens = 0
     max_pages = 5  # Check first 5 pages to capture all ETH tokens
+    records_per_page = 100
 
     log(f"Fetching Smart Money data with pagination (max {max_pages} pages)...")
 
+    def fetch_page(page):
+        payload = {**base_payload, "pagination": {"page": page, "recordsPerPage": records_per_page}}
+        r = SESSION.post(SMART_MONEY_URL, headers=HEADERS, json=payload, timeout=30)
+        r.raise_for_status()
+        return r.json()
+
+    def fetch_result(page):
+        try:
+            return fetch_page(page)
+        except Exception as e:
+            return e
+
+    # Page 1 first: an empty or short page means there are no further pages.
+    # Otherwise fetch the remaining pages concurrently; all results are
+    # processed in page order below.
+    results = {1: fetch_result(1)}
+    first = results[1]
+    if isinstance(first, Exception) or len(first) >= records_per_page:
+        with ThreadPoolExecutor(max_workers=max_pages - 1) as pool:
+            pages = range(2, max_pages + 1)
+            results.update(zip(pages, pool.map(fetch_result, pages)))
+
     for page in range(1, max_pages + 1):
-        # Update page number
-        payload = base_payload.copy()
-        payload["pagination"]["page"] = page
-        
+        if page not in results:  # Short previous page, nothing more to fetch
+            break
+        data = results[page]
+        if isinstance(data, Exception):
+            log(f"  Page {page}: Failed - {data}")
+            # Don't break, try next page
+            continue
+        if not data:  # Empty page, we've reached the end
+            log(f"  Page {page}: Empty, stopping pagination")
+            break
+
         try:
-            log(f"  Page {page}...")
-            r = requests.post(SMART_MONEY_URL, headers=HEADERS, json=payload, timeout=30)
-            r.raise_for_status()
-            
-            data = r.json()
-            if not data:  # Empty page, we've reached the end
-                log(f"  Page {page}: Empty, stopping pagination")
-                break
-                
             log(f"  Page {page}: {len(data)} tokens")
-            all_data.extend(data)
-            
-            # Look for ETH tokens on this page
-            page_eth_tokens = []
-            for d in data:
-                ch = (d.get("chain") or "").lower()
-                addr = (d.get("tokenAddress") or "").lower()
-                sym = (d.get("symbol") or d.get("tokenSymbol") or "").replace("🌱", "").strip().upper()
-                
-                is_l1_eth_addr = (ch == "ethereum" and addr in ETH_ADDR_BASKET)
-                is_eth_symbol = (sym in ETH_SYMBOL_BASKET)
-                
-                if is_l1_eth_addr or is_eth_symbol:
-                    eth_token = {
-                        "symbol": sym,
-                        "address": addr,
-                        "vol24h": d.get("volume24hUSD"),
-                        "vol7d": d.get("volume7dUSD"),
-                        "vol30d": d.get("volume30dUSD"),
-                        "page": page,
-                        "matched_by": "address" if is_l1_eth_addr else "symbol"
-                    }
-                    page_eth_tokens.append(eth_token)
-                    all_eth_tokens.append(d)  # Keep original data for aggregation
-            
-            if page_eth_tokens:
-                log(f"  Page {page}: Found {len(page_eth_tokens)} ETH tokens:")
-                for token in page_eth_tokens:
-                    vol7d = token["vol7d"] or 0
-                    vol30d = token["vol30d"] or 0
-                    log(f"    {token['symbol']:8s} | 7d: {vol7d:>10,.0f} | 30d: {vol30d:>10,.0f}")
+            total_tokens += len(data)
+
+            # Look for ETH tokens on this page (one vectorized pass over the page)
+            page_df = pd.DataFrame(data)
+            page_df["_chain"] = _str_col(page_df, "chain").str.lower()
+            page_df["_addr"] = _str_col(page_df, "tokenAddress").str.lower()
+            page_df["_sym"] = (
+                _str_col(page_df, "symbol").replace("", pd.NA)
+                .fillna(_str_col(page_df, "tokenSymbol"))
+                .str.translate(_TRASH_TABLE).str.strip().str.upper()
+            )
+
+            is_l1_eth_addr = (page_df["_chain"] == "ethereum") & page_df["_addr"].isin(ETH_ADDR_BASKET)
+            is_eth_symbol = page_df["_sym"].isin(ETH_SYMBOL_BASKET)
+            page_df["matched_by"] = np.where(is_l1_eth_addr, "address", "symbol")
+            page_eth = (
+                page_df.loc[is_l1_eth_addr | is_eth_symbol]
+                .reindex(columns=_MATCH_COLS)
+                .assign(page=page)
+            )
+
+            if not page_eth.empty:
+                pages_out.append(page_eth)
+                eth_tokens += len(page_eth)
+                log(f"  Page {page}: Found {len(page_eth)} ETH tokens:")
+                for sym, vol7d, vol30d in _vol_rows(page_eth):
+                    log(f"    {sym:8s} | 7d: {vol7d:>10,.0f} | 30d: {vol30d:>10,.0f}")
             
         except Exception as e:
             log(f"  Page {page}: Failed - {e}")
             # Don't break, try next page
             continue
+        finally:
+            flush_log()
 
-    log(f"Pagination complete. Total tokens: {len(all_data)}, ETH tokens: {len(all_eth_tokens)}")
+    log(f"Pagination complete. Total tokens: {total_tokens}, ETH tokens: {eth_tokens}")
 
-    # Aggregate ETH token volumes across all pages
-    vol24 = vol7 = vol30 = 0.0
-    matches = []
-    dedupe_addresses = set()  # Avoid double-counting same token on multiple pages
-    
-    for d in all_eth_tokens:
-        ch = (d.get("chain") or "").lower()
-        addr = (d.get("tokenAddress") or "").lower()
-        sym = (d.get("symbol") or d.get("tokenSymbol") or "").replace("🌱", "").strip().upper()
-        
-        # Dedupe by address to avoid counting same token multiple times
-        if addr in dedupe_addresses:
-            continue
-        dedupe_addresses.add(addr)
-        
-        matches.append({
-            "chain": ch,
-            "symbol": sym,
-            "tokenAddress": d.get("tokenAddress"),
-            "vol24h": d.get("volume24hUSD"),
-            "vol7d": d.get("volume7dUSD"),
-            "vol30d": d.get("volume30dUSD"),
-            "matched_by": "address" if (ch == "ethereum" and addr in ETH_ADDR_BASKET) else "symbol"
-        })
-        
-        try:
-            vol24 += float(d.get("volume24hUSD") or 0)
-            vol7 += float(d.get("volume7dUSD") or 0)
-            vol30 += float(d.get("volume30dUSD") or 0)
-        except Exception:
-            pass
+    # Aggregate ETH token volumes across all pages.
+    # Dedupe by address to avoid counting same token on multiple pages
+    if pages_out:
+        matches = pd.concat(pages_out, ignore_index=True).drop_duplicates(subset="_addr", keep="first")
+    else:
+        matches = pd.DataFrame(columns=_MATCH_COLS + ["page"])
+    vol24 = float(_num_col(matches, "volume24hUSD").sum())
+    vol7 = float(_num_col(matches, "volume7dUSD").sum())
+    vol30 = float(_num_col(matches, "volume30dUSD").sum())
 
     # Debug output
     log(f"ETH Smart Money aggregation:")
@@ -252,12 +413,10 @@ def fetch_smart_money_inflows_eth() -> pd.DataFrame:
     log(f"  7d volume:  ${vol7:,.0f}")
     log(f"  30d volume: ${vol30:,.0f}")
     
-    if matches:
+    if not matches.empty:
         log("ETH tokens breakdown:")
-        for match in matches:
-            vol7d = match["vol7d"] or 0
-            vol30d = match["vol30d"] or 0
-            log(f"  {match['symbol']:8s} | 7d: {vol7d:>12,.0f} | 30d: {vol30d:>12,.0f}")
+        for sym, vol7d, vol30d in _vol_rows(matches):
+            log(f"  {sym:8s} | 7d: {vol7d:>12,.0f} | 30d: {vol30d:>12,.0f}")
 
     return pd.DataFrame([{
         "ts": TODAY,
@@ -361,9 +520,9 @@ def fetch_flow_intelligence_eth() -> pd.DataFrame:
 #    return pd.DataFrame([{"ts": ts, "price_usd": close}])
 
 def fetch_kraken_price_eth() -> pd.DataFrame:
-    r = requests.get(KRAKEN_OHLC_URL, timeout=15)
+    r = SESSION.get(KRAKEN_OHLC_URL, headers=KRAKEN_HEADERS, timeout=15)
     r.raise_for_status()
-    js = r.json()["result"]
+    js = orjson.loads(r.content)["result"]
     key = next(k for k in js.keys() if k != "last")
     last_bar = js[key][-1]
     close = float(last_bar[4])
@@ -380,16 +539,35 @@ def build_signal(sm_df: pd.DataFrame,
     Merge all series, compute z-scores on 7d volumes and price returns,
     and output daily signals.
     """
-    df = (
-        sm_df.set_index("ts")
-        .join(ex_df.set_index("ts"), how="outer")
-        .join(px_df.set_index("ts"), how="outer")
-        .sort_index()
-    )
-
-    # Price returns
-    df["px_ret_7d"] = df["price_usd"].pct_change(7, fill_method=None)
-    df["px_ret_30d"] = df["price_usd"].pct_change(30, fill_method=None)
+    # Outer-join on the (unique, daily) ts key: union of dates, then scatter
+    # each source column into place with searchsorted
+    sources = (sm_df, ex_df, px_df)
+    all_ts = np.union1d(np.union1d(sm_df["ts"].to_numpy(), ex_df["ts"].to_numpy()),
+                        px_df["ts"].to_numpy())
+    cols = {"ts": all_ts}
+    for src in sources:
+        idx = np.searchsorted(all_ts, src["ts"].to_numpy())
+        for name in src.columns.drop("ts"):
+            vals = src[name].to_numpy()
+            if vals.dtype.kind in "fiu":
+                col = np.full(len(all_ts), np.nan)
+            else:
+                col = np.full(len(all_ts), None, dtype=object)
+            col[idx] = vals
+            cols[name] = col
+    df = pd.DataFrame(cols)
+
+    # Price returns (same as pct_change(n, fill_method=None), on the raw array)
+    p = df["price_usd"].to_numpy(dtype=float, na_value=np.nan)
+
+    def pct_ret(n):
+        out = np.full_like(p, np.nan)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            out[n:] = p[n:] / p[:-n] - 1
+        return out
+
+    df["px_ret_7d"] = pct_ret(7)
+    df["px_ret_30d"] = pct_ret(30)
    
     # z-scores on 7d and 30d SM volumes
     df["sm_7d_z"] = zscore_ewm(df["volume7dUSD"])
@@ -402,23 +580,20 @@ def build_signal(sm_df: pd.DataFrame,
     df["divergence_7d"] = df["sm_7d_z"] - df["px_ret_7d_z"]
     df["divergence_30d"] = df["sm_30d_z"] - df["px_ret_30d_z"]
 
-    def decide(row):
-        if pd.isna(row["sm_7d_z"]) or pd.isna(row["px_ret_7d"]):
-            return "hold"
+    # Vectorized signal rules
+    sm = df["sm_7d_z"].to_numpy(dtype=float, na_value=np.nan)
+    ret = df["px_ret_7d"].to_numpy(dtype=float, na_value=np.nan)
+    ex = df["exchange_flow_usd"].to_numpy(dtype=float, na_value=np.nan)
 
-        # Bullish: SM buying (z > 1.5) while price is flat/down; confirm no big CEX inflow
-        if row["sm_7d_z"] > 1.5 and (row["px_ret_7d"] is not None and row["px_ret_7d"] <= 0):
-            if (row.get("exchange_flow_usd") is None) or (row["exchange_flow_usd"] <= 0):
-                return "long"
+    nan_mask = np.isnan(sm) | np.isnan(ret)
+    # Bullish: SM buying (z > 1.5) while price is flat/down; confirm no big CEX inflow
+    long_mask = (sm > 1.5) & (ret <= 0) & (np.isnan(ex) | (ex <= 0))
+    # Bearish / exit: SM flow z < 0
+    flat_mask = sm < 0
 
-        # Bearish / exit: SM flow z < 0
-        if row["sm_7d_z"] < 0:
-            return "flat"
-
-        return "hold"
-
-    df["signal"] = df.apply(decide, axis=1)
-    return df.reset_index()
+    df["signal"] = np.select([nan_mask, long_mask, flat_mask],
+                             ["hold", "long", "flat"], default="hold")
+    return df
 
 
 # =========================================================
@@ -428,45 +603,50 @@ def main():
     try:
         log("Fetching Smart Money inflows (ETH)...")
         sm = fetch_smart_money_inflows_eth()
-        sm_all = append_parquet(sm, F_SM, dedupe_cols=("ts",))
+        sm_all = append_parquet(sm, F_SM, dedupe_cols=("ts",), schema=SM_SCHEMA)
 
     # Seed 6 dummy days so z-scores don't stay NaN at the start
         if len(sm_all) == 1:   # first run only (we only have today's row)
             rows = []
             for i in range(6, 0, -1):
                 rows.append({
-                    "ts": TODAY - timedelta(days=i),
+                    "ts": TODAY - np.timedelta64(i, "D"),
                     "symbol": "ETH/WETH",
                     "volume24hUSD": 0.0,
                     "volume7dUSD": 0.0,
                     "volume30dUSD": 0.0
                 })
-            sm_all = append_parquet(pd.DataFrame(rows), F_SM, dedupe_cols=("ts",))
+            sm_all = append_parquet(pd.DataFrame(rows), F_SM, dedupe_cols=("ts",), schema=SM_SCHEMA)
+
+        flush_log()
 
         log("Fetching Flow Intelligence (ETH -> Exchanges)...")
         ex = fetch_flow_intelligence_eth()
-        ex_all = append_parquet(ex, F_EX, dedupe_cols=("ts",))
+        ex_all = append_parquet(ex, F_EX, dedupe_cols=("ts",), schema=EX_SCHEMA)
+
+        flush_log()
 
         log("Fetching Kraken price...")
         px = fetch_kraken_price_eth()
-        px_all = append_parquet(px, F_PX, dedupe_cols=("ts",))
+        px_all = append_parquet(px, F_PX, dedupe_cols=("ts",), schema=PX_SCHEMA)
+
+        flush_log()
 
         log("Building signal...")
         signals_all = build_signal(sm_all, ex_all, px_all)
-        today_sig = signals_all[signals_all["ts"] == TODAY].copy()
+        # No .copy(): today_sig is only read (append_parquet serializes via arrow)
+        today_sig = signals_all.loc[signals_all["ts"] == TODAY]
         if today_sig.empty:
             # Fallback to last available row
-            today_sig = signals_all.tail(1).copy()
+            today_sig = signals_all.tail(1)
 
-        append_parquet(today_sig, F_SIG, dedupe_cols=("ts",))
+        append_parquet(today_sig, F_SIG, dedupe_cols=("ts",), schema=SIG_SCHEMA)
 
-        r = today_sig.iloc[-1].to_dict()
+        # Take the row once; fields are read from it below
+        r = today_sig.iloc[-1]
 
         def fmt(x, f):
-            try:
-                return f.format(x)
-            except Exception:
-                return str(x)
+            return f.format(x) if pd.notna(x) else str(x)
 
         # Create intuitive message about smart money activity
         def interpret_smart_money_activity(vol_7d, vol_30d, z_7d, z_30d, signal, px_ret_7d, exchange_flow):
@@ -539,7 +719,7 @@ def main():
             interpret_smart_money_activity(vol_7d, vol_30d, z_7d, z_30d, signal, px_ret_7d, exchange_flow)
 
         msg = (
-            f"*🧠 ETH Smart Money Update — {r.get('ts')}*\n"
+            f"*🧠 ETH Smart Money Update — {np.datetime64(r.get('ts'), 'D')}*\n"
             f"\n*📊 SIGNAL: {signal.upper()}*\n"
             f"{signal_reason}\n"
             f"\n*💰 Smart Money Activity:*\n"
@@ -554,11 +734,13 @@ def main():
         )
         send_telegram(msg)
         log("Done.")
+        flush_log()
 
     except Exception as e:
         err = f"[ERROR] {datetime.now(timezone.utc)} {e}"
         log(err)
         send_telegram(f"⚠️ ETH SM job failed: {e}")
+        flush_log()
         import traceback
         traceback.print_exc(file=sys.stderr)
         sys.exit(1)